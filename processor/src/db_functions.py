@@ -13,6 +13,7 @@ from typing import Optional, Tuple, Dict, Any
 from dotenv import load_dotenv
 from src.metrics import PipelineMetrics, ErrorCategory
 from src.logger_config import get_logger
+from src.utils import read_full_text
 
 logger = get_logger(__name__)
 
@@ -139,7 +140,7 @@ def clean_and_transform(key, raw_data):
         raw_data.get('abstract'),
         raw_data.get('pdf_url'),
         raw_data.get('full_arxiv_url'),
-        raw_data.get('full_text'),
+        read_full_text(raw_data),
         json.dumps(keyword_list)
     )
 
@@ -199,7 +200,7 @@ def dump_metadata_to_db(json_filepath: str, db_path: str,
 
     # Load metadata from JSON
     try:
-        with open(json_filepath, "r") as f:
+        with open(json_filepath, "r", encoding="utf-8") as f:
             data = json.load(f)
         logger.info(f"Loaded {len(data)} papers from JSON", extra={"file": json_filepath})
     except FileNotFoundError:
@@ -308,7 +309,7 @@ def dump_metadata_to_db(json_filepath: str, db_path: str,
                     clean_str(paper.get('abstract')),
                     clean_str(paper.get('pdf_url')),
                     clean_str(paper.get('full_arxiv_url')),
-                    clean_str(paper.get('full_text')),
+                    clean_str(read_full_text(paper)),
                     json_list(keywords_list)
                 )
 
@@ -17,16 +17,99 @@ import re
 import sys
 import json
 import time
+import asyncio
 import requests
 from typing import Tuple, Optional, Dict, Any, List
 
+import pyarrow as pa
+import pyarrow.parquet as pq
 from openai import OpenAI
 from dotenv import load_dotenv
 from src.metrics import PipelineMetrics, ErrorCategory
 from src.logger_config import get_logger
+from src.utils import read_full_text
 
 logger = get_logger(__name__)
 
+# read environment once at import rather than on every query
+load_dotenv()
+_OLLAMA_URL = os.getenv("OLLAMA_API")
+_OPENAI_KEY = os.getenv("OPENAI_KEY")
+_KWD_PROMPT = os.getenv("KEYWORD_PROMPT_1") or ""
+_DEF_PROMPT_TEMPLATE = os.getenv("DEFINTION_PROMPT_1") or ""
+
+# Ollama context window used for all local queries
+NUM_CTX = 65536
+
+# tokens reserved for the model's response when budgeting the prompt
+RESPONSE_TOKENS = 2048
+
+# how long Ollama keeps a model (and its prompt cache) loaded between calls
+OLLAMA_KEEP_ALIVE = "10m"
+
+# Extracted text has no blank lines, and short lines (e.g. a bare "2" heading number) are
+# dropped, so headings are matched as whole lines by their words, numbering optional
+_INTRO_HEADING = re.compile(r"^[ \t]*(?:(?:1|I)\.?[ \t]+)?Introduction[ \t]*$", re.IGNORECASE | re.MULTILINE)
+
+# heading that opens the section after the introduction, e.g. "Related Work" or "II. METHODS"
+_SECTION_TWO = re.compile(
+    r"^[ \t]*(?:(?:2|II)\.?[ \t]+)?"
+    r"(?:Related Works?|Background|Background and Related Work|Related Work and Background|Prior Work|"
+    r"Literature Review|Preliminaries|Problem (?:Setup|Setting|Statement|Formulation|Definition)|"
+    r"Methods?|Methodology|Approach|Proposed Method|Our Approach|Model|Framework|Overview|"
+    r"(?:Experimental )?Setup|Experiments?)[ \t]*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+# sentence boundary; lines are layout-wrapped, so sentences are the unit of selection
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+def truncate_paper_text(paper_txt: str, keywords: List[str], sys_prompt: str, num_ctx: int = NUM_CTX) -> str:
+    """
+    Trim paper text to fit the model's context window (~4 chars/token).
+
+    Keeps everything up to the end of the introduction (title, abstract, introduction),
+    then any later sentence that mentions one of the keywords, in their original order.
+    If the introduction's end can't be located, keeps the leading text that fits. Text
+    that already fits is returned unchanged.
+
+    Args:
+        paper_txt: Full paper text
+        keywords: Keywords that will be defined from the text
+        sys_prompt: Prompt prepended to the paper text
+        num_ctx: Context window size in tokens
+
+    Returns:
+        Paper text that fits within the context budget
+    """
+    max_chars = (num_ctx - len(sys_prompt) // 4 - RESPONSE_TOKENS) * 4
+    if len(paper_txt) <= max_chars:
+        return paper_txt
+
+    # abstract + introduction end where section 2 starts
+    intro = _INTRO_HEADING.search(paper_txt)
+    match = _SECTION_TWO.search(paper_txt, intro.end() if intro else 1)
+    if not match or match.start() >= max_chars:
+        logger.debug(f"Truncated paper text to leading budget", extra={"original_chars": len(paper_txt), "max_chars": max_chars})
+        return paper_txt[:max_chars]
+
+    head_end = match.start()
+    kept = [paper_txt[:head_end].rstrip("\n")]
+    budget = max_chars - len(kept[0])
+
+    keywords_lower = [kw.lower() for kw in keywords]
+    for sentence in _SENTENCE_END.split(paper_txt[head_end:]):
+        if len(sentence) + 1 > budget:
+            continue
+        # sentences span layout line breaks, so a keyword may be split across lines
+        sentence_lower = " ".join(sentence.lower().split())
+        if any(kw in sentence_lower for kw in keywords_lower):
+            kept.append(sentence)
+            budget -= len(sentence) + 1
+
+    logger.debug(f"Truncated paper text for context window", extra={"original_chars": len(paper_txt), "max_chars": max_chars})
+    return "\n".join(kept)
+
 def query_keywords(abstract_txt: str, model: str = "gemma3:4b") -> Tuple[str, float, Optional[str]]:
     """
     Query Ollama model to extract keywords from abstract.
@@ -38,10 +121,7 @@ def query_keywords(abstract_txt: str, model: str = "gemma3:4b") -> Tuple[str, fl
     Returns:
         Tuple of (response, duration, error_msg)
     """
-    ollama_url = os.getenv("OLLAMA_API")
-    sys_prompt = os.getenv("KEYWORD_PROMPT_1")
-
-    if not ollama_url:
+    if not _OLLAMA_URL:
         error_msg = "OLLAMA_API environment variable not set"
         logger.error(error_msg)
         return "", 0.0, error_msg
@@ -49,20 +129,28 @@ def query_keywords(abstract_txt: str, model: str = "gemma3:4b") -> Tuple[str, fl
     headers = {"Content-Type": "application/json"}
     data = {
         "model": model,
-        "prompt": sys_prompt + abstract_txt,
+        "prompt": _KWD_PROMPT + abstract_txt,
         "stream": True,
+        # keep the model loaded so the shared prompt prefix hits the KV cache on the next paper
+        "keep_alive": OLLAMA_KEEP_ALIVE,
         "options": {
-            "num_ctx": 65536
+            # the model stops generating once the keyword list is closed
+            "stop": ["]"],
+            "num_ctx": NUM_CTX,
+            "num_predict": 256,
+            "temperature": 0
         }
     }
 
     model_response = ""
+    depth = 0
+    opened = False
     t0 = time.time()
 
     try:
         logger.debug(f"Querying Ollama for keywords", extra={"model": model})
 
-        with requests.post(ollama_url, headers=headers, json=data, stream=True, timeout=60) as response:
+        with requests.post(_OLLAMA_URL, headers=headers, json=data, stream=True, timeout=60) as response:
             if response.status_code != 200:
                 duration = time.time() - t0
                 error_msg = f"HTTP {response.status_code}: {response.text[:200]}"
@@ -78,6 +166,21 @@ def query_keywords(abstract_txt: str, model: str = "gemma3:4b") -> Tuple[str, fl
                     except json.JSONDecodeError:
                         continue
 
+                    # stop reading once a balanced [...] has been captured
+                    for ch in text:
+                        if ch == "[":
+                            depth += 1
+                            opened = True
+                        elif ch == "]" and depth:
+                            depth -= 1
+                    if opened and depth == 0:
+                        response.close()
+                        break
+
+        # Ollama does not echo the stop sequence, so close the list for check_keywords
+        if opened and depth > 0:
+            model_response += "]" * depth
+
         duration = time.time() - t0
         logger.info(f"Keywords extracted", extra={"model": model, "duration": duration, "response_length": len(model_response)})
         return model_response, duration, None
@@ -117,7 +220,7 @@ def query_definitions(keywords: List[str], paper_txt: str, model: str = "gemma3:
     if not keywords:
         return "{}", 0.0, "No keywords provided"
 
-    sys_prompt = f"{os.getenv('DEFINTION_PROMPT_1')} {keywords}. Here is the paper itself: "
+    sys_prompt = f"{_DEF_PROMPT_TEMPLATE} {keywords}. Here is the paper itself: "
 
     # OpenAI path
     if openai:
@@ -125,7 +228,7 @@ def query_definitions(keywords: List[str], paper_txt: str, model: str = "gemma3:
         t0 = time.time()
 
         try:
-            client = OpenAI(api_key=os.environ.get("OPENAI_KEY"))
+            client = OpenAI(api_key=_OPENAI_KEY)
             response = client.responses.create(
                 model="gpt-5-mini",
                 instructions="You are a Python dictionary generator. Do not return anything except for a valid Python dictionary.",
@@ -141,19 +244,24 @@ def query_definitions(keywords: List[str], paper_txt: str, model: str = "gemma3:
             logger.error(f"OpenAI definition query failed: {error_msg}", extra={"duration": duration})
             return "", duration, error_msg
 
-    ollama_url = os.getenv("OLLAMA_API")
-    if not ollama_url:
+    if not _OLLAMA_URL:
         error_msg = "OLLAMA_API environment variable not set"
         logger.error(error_msg)
         return "", 0.0, error_msg
 
+    # pre-truncate so oversized papers are not uploaded only to be cut off by Ollama
+    paper_txt = truncate_paper_text(paper_txt, keywords, sys_prompt)
+
     headers = {"Content-Type": "application/json"}
     data = {
         "model": model,
         "prompt": sys_prompt + paper_txt,
         "stream": True,
+        "keep_alive": OLLAMA_KEEP_ALIVE,
         "options": {
-            "num_ctx": 65536
+            "num_ctx": NUM_CTX,
+            "num_predict": RESPONSE_TOKENS,
+            "temperature": 0
         }
     }
 
@@ -163,7 +271,7 @@ def query_definitions(keywords: List[str], paper_txt: str, model: str = "gemma3:
     try:
         logger.debug(f"Querying Ollama for definitions", extra={"model": model, "num_keywords": len(keywords)})
 
-        with requests.post(ollama_url, headers=headers, json=data, stream=True, timeout=120) as response:
+        with requests.post(_OLLAMA_URL, headers=headers, json=data, stream=True, timeout=120) as response:
             if response.status_code != 200:
                 duration = time.time() - t0
                 error_msg = f"HTTP {response.status_code}: {response.text[:200]}"
@@ -293,33 +401,48 @@ def clean_keywords(definitions: Dict[str, str]) -> int:
     Returns:
         Count of keywords with valid definitions
     """
-    num_keywords_defined = 0
-
-    for word, definition in definitions.items():
-        if definition and definition != 'None':
-            num_keywords_defined += 1
-
-    return num_keywords_defined
+    return sum(1 for v in definitions.values() if v and v != 'None')
             
     
+def save_keyword_table(rows: List[Tuple[str, str, str]], filepath: str) -> None:
+    """
+    Write (paper_id, keyword, definition) rows to a Parquet file.
+
+    Columnar companion to the metadata JSON so downstream analytics can scan every
+    keyword without deserializing full paper records.
+
+    Args:
+        rows: List of (paper_id, keyword, definition) tuples
+        filepath: Destination .parquet path
+    """
+    columns = list(zip(*rows)) if rows else [(), (), ()]
+    table = pa.Table.from_arrays(
+        [pa.array(col, type=pa.string()) for col in columns],
+        names=["paper_id", "keyword", "definition"]
+    )
+    pq.write_table(table, filepath)
+
 def generate_keywords_and_defs(batch_filepath: str, kwd_model: str = "gemma3:12b",
                                def_model: str = "llama3.3", openai: bool = False,
-                               metrics: Optional[PipelineMetrics] = None) -> Tuple[int, int, int]:
+                               metrics: Optional[PipelineMetrics] = None,
+                               concurrency: int = 4) -> Tuple[int, int, int]:
     """
     Extract keywords and definitions from papers using LLMs.
 
+    Each paper's definition query is sent as soon as its keywords parse, so the
+    keyword and definition stages overlap across papers.
+
     Args:
         batch_filepath: Path to JSON file with paper metadata
         kwd_model: Model to use for keyword extraction
         def_model: Model to use for definition extraction
         openai: Whether to use OpenAI for definitions
         metrics: Optional PipelineMetrics object for tracking
+        concurrency: Maximum number of papers processed at once
 
     Returns:
         Tuple of (num_papers, num_keywords_extracted, num_papers_with_defs)
     """
-    load_dotenv()
-
     logger.info(f"Starting LLM processing", extra={
         "file": batch_filepath,
         "kwd_model": kwd_model,
@@ -328,7 +451,7 @@ def generate_keywords_and_defs(batch_filepath: str, kwd_model: str = "gemma3:12b
     })
 
     try:
-        with open(batch_filepath, "r") as f:
+        with open(batch_filepath, "r", encoding="utf-8") as f:
             metadata_dict = json.load(f)
 
     except FileNotFoundError:
@@ -345,134 +468,147 @@ def generate_keywords_and_defs(batch_filepath: str, kwd_model: str = "gemma3:12b
             metrics.record_error(ErrorCategory.VALIDATION_ERROR, error_msg, {"file": batch_filepath})
         return 0, 0, 0
 
-    updated_dict = {}
     num_kwds_generated = 0
     num_papers_with_defs = 0
-    num_papers = len(metadata_dict.keys())
+    num_papers = len(metadata_dict)
 
-    logger.info(f"Processing {num_papers} papers for keyword/definition extraction")
+    logger.info(f"Processing {num_papers} papers for keyword/definition extraction", extra={"concurrency": concurrency})
 
-    for i in range(num_papers):
-        paper_id = str(i)
-        paper = metadata_dict[paper_id]
-        arxiv_url = paper.get('full_arxiv_url', 'Unknown')
+    def _mark_failed(paper, reason_metric=None, kws=None):
+        """Clear a paper's LLM outputs (keeping any parsed keywords) and count the failure."""
+        paper["keywords"] = kws or []
+        paper["definitions"] = {}
+        if reason_metric and metrics:
+            metrics.increment(reason_metric)
 
-        if metrics:
-            metrics.increment("llm.papers_processed")
+    async def process_paper(i, paper_id, paper, sem):
+        """Run keyword then definition extraction for one paper, updating it in place."""
+        nonlocal num_kwds_generated, num_papers_with_defs
 
-        logger.debug(f"Processing paper {i+1}/{num_papers}", extra={"arxiv_url": arxiv_url})
-
-        # Check if paper has text
-        if not paper.get('full_text'):
-            logger.info(f"Skipping paper (no full text)", extra={"paper_id": paper_id, "arxiv_url": arxiv_url})
-            paper["keywords"] = []
-            paper["definitions"] = {}
-            updated_dict[paper_id] = paper
+        async with sem:
+            arxiv_url = paper.get('full_arxiv_url', 'Unknown')
 
             if metrics:
-                metrics.increment("llm.papers_skipped_no_text")
-            continue
+                metrics.increment("llm.papers_processed")
+
+            logger.debug(f"Processing paper {i}/{num_papers}", extra={"arxiv_url": arxiv_url})
+
+            # Check if paper has text
+            paper_txt = await asyncio.to_thread(read_full_text, paper)
+            if not paper_txt:
+                logger.info(f"Skipping paper (no full text)", extra={"paper_id": paper_id, "arxiv_url": arxiv_url})
+                _mark_failed(paper, "llm.papers_skipped_no_text")
+                return
+
+            # extract keywords from abstract; blocking HTTP calls run in worker threads
+            kwd_response, kwd_duration, kwd_error = await asyncio.to_thread(
+                query_keywords,
+                abstract_txt=paper['abstract'],
+                model=kwd_model
+            )
 
-        # extract keywords from abstract
-        kwd_response, kwd_duration, kwd_error = query_keywords(
-            abstract_txt=paper['abstract'],
-            model=kwd_model
-        )
+            if kwd_error:
+                if metrics:
+                    metrics.record_error(
+                        ErrorCategory.LLM_ERROR,
+                        f"Keyword query failed: {kwd_error}",
+                        {"paper_id": paper_id, "arxiv_url": arxiv_url, "model": kwd_model}
+                    )
+                _mark_failed(paper, "llm.keywords_extraction_failed")
+                return
+
+            keywords, kwd_parse_success, kwd_parse_error = check_keywords(kwd_response)
+
+            if not kwd_parse_success or not keywords:
+                if metrics:
+                    metrics.record_error(
+                        ErrorCategory.LLM_ERROR,
+                        f"Keyword parsing failed: {kwd_parse_error}",
+                        {"paper_id": paper_id, "arxiv_url": arxiv_url, "raw_response": kwd_response[:200]}
+                    )
+                _mark_failed(paper, "llm.keywords_extraction_failed")
+                return
 
-        if kwd_error:
             if metrics:
-                metrics.increment("llm.keywords_extraction_failed")
-                metrics.record_error(
-                    ErrorCategory.LLM_ERROR,
-                    f"Keyword query failed: {kwd_error}",
-                    {"paper_id": paper_id, "arxiv_url": arxiv_url, "model": kwd_model}
-                )
-            paper["keywords"] = []
-            paper["definitions"] = {}
-            updated_dict[paper_id] = paper
-            continue
+                metrics.increment("llm.keywords_extraction_success")
+                metrics.increment("llm.total_keywords_extracted", len(keywords))
+
+            logger.info(f"Extracted {len(keywords)} keywords", extra={"paper_id": paper_id, "keywords": keywords})
+
+            # extract definitions as soon as this paper's keywords are ready
+            def_response, def_duration, def_error = await asyncio.to_thread(
+                query_definitions,
+                keywords=keywords,
+                paper_txt=paper_txt,
+                model=def_model,
+                openai=openai
+            )
 
-        keywords, kwd_parse_success, kwd_parse_error = check_keywords(kwd_response)
+            if def_error:
+                if metrics:
+                    metrics.record_error(
+                        ErrorCategory.LLM_ERROR,
+                        f"Definition query failed: {def_error}",
+                        {"paper_id": paper_id, "arxiv_url": arxiv_url, "model": def_model, "openai": openai}
+                    )
+                _mark_failed(paper, "llm.definitions_extraction_failed", kws=keywords)
+                return
+
+            definitions, def_parse_success, def_parse_error = check_definitions(def_response)
+
+            if not def_parse_success:
+                if metrics:
+                    metrics.record_error(
+                        ErrorCategory.LLM_ERROR,
+                        f"Definition parsing failed: {def_parse_error}",
+                        {"paper_id": paper_id, "arxiv_url": arxiv_url, "raw_response": def_response[:200]}
+                    )
+                _mark_failed(paper, "llm.definitions_extraction_failed", kws=keywords)
+                return
 
-        if not kwd_parse_success or not keywords:
             if metrics:
-                metrics.increment("llm.keywords_extraction_failed")
-                metrics.record_error(
-                    ErrorCategory.LLM_ERROR,
-                    f"Keyword parsing failed: {kwd_parse_error}",
-                    {"paper_id": paper_id, "arxiv_url": arxiv_url, "raw_response": kwd_response[:200]}
-                )
-            paper["keywords"] = []
-            paper["definitions"] = {}
-            updated_dict[paper_id] = paper
-            continue
+                metrics.increment("llm.definitions_extraction_success")
 
-        if metrics:
-            metrics.increment("llm.keywords_extraction_success")
-            metrics.increment("llm.total_keywords_extracted", len(keywords))
+            # check_definitions already dropped empty/'None' values
+            num_valid_defs = len(definitions)
+            num_kwds_generated += num_valid_defs
 
-        logger.info(f"Extracted {len(keywords)} keywords", extra={"paper_id": paper_id, "keywords": keywords})
+            if definitions:
+                num_papers_with_defs += 1
 
-        # extract definitions for keywords
-        def_response, def_duration, def_error = query_definitions(
-            keywords=keywords,
-            paper_txt=paper['full_text'],
-            model=def_model,
-            openai=openai
-        )
-
-        if def_error:
             if metrics:
-                metrics.increment("llm.definitions_extraction_failed")
-                metrics.record_error(
-                    ErrorCategory.LLM_ERROR,
-                    f"Definition query failed: {def_error}",
-                    {"paper_id": paper_id, "arxiv_url": arxiv_url, "model": def_model, "openai": openai}
-                )
-            paper["keywords"] = keywords
-            paper["definitions"] = {}
-            updated_dict[paper_id] = paper
-            continue
+                metrics.increment("llm.total_definitions_extracted", num_valid_defs)
+                keywords_without_defs = len(keywords) - num_valid_defs
+                if keywords_without_defs > 0:
+                    metrics.increment("llm.keywords_without_definitions", keywords_without_defs)
 
-        definitions, def_parse_success, def_parse_error = check_definitions(def_response)
+            logger.info(f"Extracted {num_valid_defs} valid definitions", extra={
+                "paper_id": paper_id,
+                "total_keywords": len(keywords),
+                "valid_definitions": num_valid_defs
+            })
 
-        if not def_parse_success:
-            if metrics:
-                metrics.increment("llm.definitions_extraction_failed")
-                metrics.record_error(
-                    ErrorCategory.LLM_ERROR,
-                    f"Definition parsing failed: {def_parse_error}",
-                    {"paper_id": paper_id, "arxiv_url": arxiv_url, "raw_response": def_response[:200]}
-                )
             paper["keywords"] = keywords
-            paper["definitions"] = {}
-            updated_dict[paper_id] = paper
-            continue
+            paper["definitions"] = definitions
 
-        if metrics:
-            metrics.increment("llm.definitions_extraction_success")
+    async def process_all():
+        # bound the number of papers in flight so Ollama/OpenAI are not flooded
+        sem = asyncio.Semaphore(concurrency)
+        async with asyncio.TaskGroup() as tg:
+            for i, (paper_id, paper) in enumerate(metadata_dict.items(), 1):
+                tg.create_task(process_paper(i, paper_id, paper, sem))
 
-        num_valid_defs = clean_keywords(definitions)
-        num_kwds_generated += num_valid_defs
+    asyncio.run(process_all())
 
-        if definitions:
-            num_papers_with_defs += 1
+    # papers are updated in place, so the original key order is preserved
+    updated_dict = metadata_dict
 
-        if metrics:
-            metrics.increment("llm.total_definitions_extracted", num_valid_defs)
-            keywords_without_defs = len(keywords) - num_valid_defs
-            if keywords_without_defs > 0:
-                metrics.increment("llm.keywords_without_definitions", keywords_without_defs)
-
-        logger.info(f"Extracted {num_valid_defs} valid definitions", extra={
-            "paper_id": paper_id,
-            "total_keywords": len(keywords),
-            "valid_definitions": num_valid_defs
-        })
-
-        paper["keywords"] = keywords
-        paper["definitions"] = definitions
-        updated_dict[paper_id] = paper
+    # flatten keywords into rows for the columnar keyword table
+    keyword_rows = []
+    for paper_id, paper in updated_dict.items():
+        definitions = paper.get("definitions", {})
+        for kw in paper.get("keywords", []):
+            keyword_rows.append((paper_id, kw, definitions.get(kw, "")))
 
     # save updated metadata
     try:
@@ -486,6 +622,21 @@ def generate_keywords_and_defs(batch_filepath: str, kwd_model: str = "gemma3:12b
         if metrics:
             metrics.record_error(ErrorCategory.VALIDATION_ERROR, error_msg, {"file": batch_filepath})
 
+    # save keyword table next to the metadata, e.g. keywords_2026-02-01.parquet
+    keywords_filepath = os.path.join(
+        os.path.dirname(batch_filepath),
+        os.path.basename(batch_filepath).replace("metadata_", "keywords_", 1).rsplit(".", 1)[0] + ".parquet"
+    )
+    try:
+        save_keyword_table(keyword_rows, keywords_filepath)
+        logger.info(f"Saved {len(keyword_rows)} keyword rows to {keywords_filepath}")
+
+    except Exception as e:
+        error_msg = f"Failed to save keyword table: {type(e).__name__}: {str(e)}"
+        logger.error(error_msg, extra={"file": keywords_filepath})
+        if metrics:
+            metrics.record_error(ErrorCategory.VALIDATION_ERROR, error_msg, {"file": keywords_filepath})
+
     logger.info(f"LLM processing complete", extra={
         "papers_processed": num_papers,
         "keywords_extracted": num_kwds_generated,
@@ -494,15 +645,30 @@ def generate_keywords_and_defs(batch_filepath: str, kwd_model: str = "gemma3:12b
 
     return num_papers, num_kwds_generated, num_papers_with_defs
 
+def _process_file(path: str) -> Tuple[int, int, int]:
+    """Process one metadata batch file; module-level so it can run in a worker process."""
+    return generate_keywords_and_defs(path, kwd_model="gemma3:12b", def_model="gemma3:12b")
+
 if __name__ == "__main__":
     from datetime import datetime
-    today = datetime.today().strftime("%Y-%M-%d")
-        
-    load_dotenv()
-
-    file_path = f"metadata/metadata_{today}.json"
-    num_papers, num_kwds, num_dicts = generate_keywords_and_defs(file_path, kwd_model="gemma3:12b", def_model="gemma3:12b", verbose=False)
-    # num_papers, num_kwds, num_dicts = generate_keywords_and_defs(file_path, kwd_model="gemma3:12b", def_model="phi3:14b", verbose=False)
-    print(f"[{sys.argv[1]}] {(num_kwds/(num_papers*3))*100:.2f}% keyword extraction rate | Out of {num_papers} total papers: num papers w/ definitions={num_dicts}, num keywords extracted={num_kwds}")
-    
-    
\ No newline at end of file
+    from concurrent.futures import ProcessPoolExecutor
+
+    # args are YYYY-MM-DD dates (as passed by update_db.sh) or batch file paths; default is today's batch
+    labels, files = [], []
+    for arg in sys.argv[1:] or [datetime.today().strftime("%Y-%m-%d")]:
+        path = f"data/metadata/metadata_{arg}.json" if re.fullmatch(r"\d{4}-\d{2}-\d{2}", arg) else arg
+        if os.path.isfile(path):
+            labels.append(arg)
+            files.append(path)
+        else:
+            logger.error(f"Metadata batch not found, skipping", extra={"file": path})
+
+    # shard by file so JSON/dict parsing in one batch overlaps LLM I/O in another;
+    # each worker reads .env once when it imports this module
+    with ProcessPoolExecutor(max_workers=max(1, (os.cpu_count() or 2) // 2)) as ex:
+        for label, (num_papers, num_kwds, num_dicts) in zip(labels, ex.map(_process_file, files)):
+            if not num_papers:
+                # an empty or unreadable batch has no rate; don't log a 0% for track_keyword_rate to average
+                continue
+            rate = (num_kwds / (num_papers * 3)) * 100
+            print(f"[{label}] {rate:.2f}% keyword extraction rate | Out of {num_papers} total papers: num papers w/ definitions={num_dicts}, num keywords extracted={num_kwds}")
@@ -5,16 +5,21 @@ Scrapes papers using the scraper options in scrapers.py
 Last updated: Feb 2026
 '''
 import os
+import re
 import sys
 import time
-import json
-import urllib.request
-from typing import Tuple, Optional, Dict, Any
-from docling.document_converter import DocumentConverter
+import shutil
+import asyncio
+import contextlib
+import orjson
+import pyarrow as pa
+import pyarrow.parquet as pq
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Tuple, Optional, Dict, Any, List, Iterable, AsyncIterable, Union
 
 # from pathlib import Path
-from pypdf import PdfReader
-from src.scrapers import get_arxiv_metadata
+import fitz  # PyMuPDF
+from src.scrapers import iter_arxiv_metadata, get_session, RateLimiter
 from src.metrics import PipelineMetrics, ErrorCategory
 from src.logger_config import get_logger
 
@@ -35,82 +40,131 @@ def download_pdf(pdf_url: str, save_dir: str, output_filename: Optional[str] = N
     if output_filename is None:
         try:
             # extract article ID from the URL path for use as the filename
-            arxiv_id = pdf_url.split('/')[-1]
-            output_filename = f"{arxiv_id}.pdf"
-        except IndexError:
+            output_filename = pdf_url.rpartition('/')[2] + ".pdf"
+        except (AttributeError, TypeError):
             error_msg = "Could not derive filename from URL"
             logger.error(f"Failed to parse arxiv_id from URL: {pdf_url}")
             return False, error_msg
 
     save_path = os.path.join(save_dir, output_filename)
     logger.debug(f"Attempting to download PDF from: {pdf_url}")
+    tmp_path = save_path + ".part"
 
     try:
-        # download file and store locally; grabs file, not byte object
-        urllib.request.urlretrieve(pdf_url, save_path)
+        # stream to a temp file so a failed download never leaves a partial PDF; copying the
+        # raw socket stream in 1MB blocks skips requests' per-chunk generator overhead
+        with get_session().get(pdf_url, stream=True, timeout=60) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            with open(tmp_path, "wb") as f:
+                shutil.copyfileobj(response.raw, f, 1 << 20)
+        os.replace(tmp_path, save_path)
         logger.info(f"Downloaded PDF successfully", extra={"arxiv_id": output_filename.replace('.pdf', ''), "url": pdf_url})
         return True, None
 
     except Exception as e:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
         error_msg = f"{type(e).__name__}: {str(e)}"
         logger.error(f"Failed to download PDF: {error_msg}", extra={"url": pdf_url, "arxiv_id": output_filename.replace('.pdf', '')})
         return False, error_msg
 
+async def download_pdfs(jobs: Union[Iterable[Tuple[Any, str, str]], AsyncIterable[Tuple[Any, str, str]]], save_dir: str,
+                        concurrency: int = 4, interval: float = 3.0) -> Dict[Any, Tuple[bool, Optional[str]]]:
+    """
+    Download several PDFs concurrently.
+
+    Request starts are still spaced `interval` seconds apart by a shared RateLimiter,
+    but transfers overlap, so slow downloads no longer serialize the whole batch.
+    `jobs` may be an async iterable, in which case each download starts as soon as
+    its job is produced rather than after the whole list is known.
+
+    Args:
+        jobs: Iterable or async iterable of (paper_id, pdf_url, pdf_filename) tuples
+        save_dir: Directory to save the PDFs
+        concurrency: Maximum number of downloads in flight
+        interval: Minimum seconds between request starts (arXiv asks for 3)
+
+    Returns:
+        Dictionary mapping paper_id to download_pdf's (success, error_message) tuple
+    """
+    sem = asyncio.Semaphore(concurrency)
+    limiter = RateLimiter(interval)
+    tasks = {}
+
+    async def fetch(pdf_url, pdf_filename):
+        async with sem:
+            await limiter.wait()
+            return await asyncio.to_thread(download_pdf, pdf_url, save_dir, pdf_filename)
+
+    async with asyncio.TaskGroup() as tg:
+        if hasattr(jobs, "__aiter__"):
+            async for paper_id, pdf_url, pdf_filename in jobs:
+                tasks[paper_id] = tg.create_task(fetch(pdf_url, pdf_filename))
+        else:
+            for paper_id, pdf_url, pdf_filename in jobs:
+                tasks[paper_id] = tg.create_task(fetch(pdf_url, pdf_filename))
+
+    return {paper_id: task.result() for paper_id, task in tasks.items()}
+
+# Translation table for clean_text: drop control characters (except newline), turn tabs
+# into spaces, and normalize common Unicode punctuation
+_CLEAN_TABLE = {c: None for c in range(32) if c not in (9, 10)}
+_CLEAN_TABLE.update({
+    0x0009: " ",    # tab
+    0x2018: "'",    # left single quote
+    0x2019: "'",    # right single quote
+    0x201C: '"',    # left double quote
+    0x201D: '"',    # right double quote
+    0x2013: "-",    # en dash
+    0x2014: "-",    # em dash
+    0x2212: "-",    # minus sign
+    0x2026: "...",  # ellipsis
+    0x00A0: " ",    # non-breaking space
+    # Latin ligatures PDF fonts emit for "fi", "fl", etc.; the useful part of NFKC
+    # for paper text, without its damage to math (x² -> x2)
+    0xFB00: "ff",
+    0xFB01: "fi",
+    0xFB02: "fl",
+    0xFB03: "ffi",
+    0xFB04: "ffl",
+})
+
+# Single-pass regexes for clean_text's line and whitespace normalization. Tabs are gone by
+# the time these run, so _LINE_BREAKS can join hyphenated breaks and drop trailing spaces
+# in one scan
+_LINE_BREAKS = re.compile(r"- *\n *| +$", re.MULTILINE)
+_MULTISPACE = re.compile(r" {2,}")
+_MULTINL = re.compile(r"\n{3,}")
+
+# Text format each extraction method produces. Formats in CLEANED_FORMATS come out ready
+# to use and must not be run through clean_text (docling's markdown would lose its
+# structure); 'plain' pypdf output is cleaned by extract_text unless clean=False. The
+# outcome is recorded per paper as 'text_format' / 'text_cleaned' so no later stage
+# cleans the same text twice.
+TEXT_FORMATS = {'pypdf': 'plain', 'docling': 'markdown'}
+CLEANED_FORMATS = frozenset({'markdown'})
+
+# each docling worker loads its own layout models, so cap its pool regardless of core count
+DOCLING_MAX_WORKERS = 2
+
 def clean_text(text: str):
     
     if not text:
         return ""
 
-    # Remove control characters (except newline and tab) 
-    cleaned_chars = []
-    for ch in text:
-        code = ord(ch)
-        if ch in ("\n", "\t") or code >= 32:
-            cleaned_chars.append(ch)
-    text = "".join(cleaned_chars)
-
-    # Normalize common Unicode punctuation 
-    replacements = {
-        "\u2018": "'",  # left single quote
-        "\u2019": "'",  # right single quote
-        "\u201C": '"',  # left double quote
-        "\u201D": '"',  # right double quote
-        "\u2013": "-",  # en dash
-        "\u2014": "-",  # em dash
-        "\u2212": "-",  # minus sign
-        "\u2026": "...",# ellipsis
-        "\u00A0": " ",  # non-breaking space
-    }
-
-    for src, tgt in replacements.items():
-        text = text.replace(src, tgt)
-
-    # Fix hyphens at line breaks
-    lines = text.splitlines()
-    fixed_lines = []
-    i = 0
-    while i < len(lines):
-        line = lines[i].rstrip()
-        if line.endswith("-") and i + 1 < len(lines):
-            next_line = lines[i + 1].lstrip()
-            fixed_lines.append(line[:-1] + next_line)
-            i += 2
-        else:
-            fixed_lines.append(line)
-            i += 1
-    text = "\n".join(fixed_lines)
+    # Remove control characters, replace tabs and normalize punctuation in one C-level pass
+    text = text.translate(_CLEAN_TABLE)
 
-    # --- 4. Normalize whitespace ---
-    # Replace tabs with spaces
-    text = text.replace("\t", " ")
+    # Fix hyphens at line breaks and drop trailing whitespace on each line
+    text = _LINE_BREAKS.sub("", text)
 
+    # --- 4. Normalize whitespace ---
     # Collapse multiple spaces
-    while "  " in text:
-        text = text.replace("  ", " ")
+    text = _MULTISPACE.sub(" ", text)
 
     # Collapse excessive newlines (3+ → 2)
-    while "\n\n\n" in text:
-        text = text.replace("\n\n\n", "\n\n")
+    text = _MULTINL.sub("\n\n", text)
 
     # Strip leading/trailing whitespace
     text = text.strip()
@@ -119,7 +173,9 @@ def clean_text(text: str):
     
 def extract_text_pypdf(pdf_filepath: str) -> Tuple[Optional[str], Optional[str]]:
     """
-    Extract text from PDF using pypdf.
+    Extract text from PDF using PyMuPDF.
+
+    Kept under the 'pypdf' method name so existing callers are unaffected.
 
     Args:
         pdf_filepath: Path to PDF file
@@ -128,21 +184,46 @@ def extract_text_pypdf(pdf_filepath: str) -> Tuple[Optional[str], Optional[str]]
         Tuple of (text: str | None, error_message: str | None)
     """
     try:
-        reader = PdfReader(pdf_filepath)
-        clean_pages = []
-        for page in reader.pages:
-            lines = (page.extract_text() or "").splitlines()
-            cleaned = [line for line in lines if len(line) >= 3]
-            clean_pages.append("\n".join(cleaned))
-        text = "\n".join(clean_pages)
-        logger.debug(f"Extracted text using pypdf: {len(text)} characters", extra={"file": os.path.basename(pdf_filepath)})
+        # drop short lines (page numbers, stray glyphs); one join over all pages
+        # avoids building per-page line lists and page strings.
+        # Opened by path on purpose: MuPDF seeks and reads only the objects each page needs,
+        # whereas fitz.open(stream=...) takes a bytes copy of the whole file (even from an mmap)
+        with fitz.open(pdf_filepath, filetype="pdf") as doc:
+            text = "\n".join(
+                line
+                for page in doc
+                for line in page.get_text("text").splitlines()
+                if len(line) >= 3
+            )
+        logger.debug(f"Extracted text using PyMuPDF: {len(text)} characters", extra={"file": os.path.basename(pdf_filepath)})
         return text, None
 
     except Exception as e:
         error_msg = f"{type(e).__name__}: {str(e)}"
-        logger.error(f"pypdf extraction failed: {error_msg}", extra={"file": pdf_filepath})
+        logger.error(f"PyMuPDF extraction failed: {error_msg}", extra={"file": pdf_filepath})
         return None, error_msg
         
+# docling converter, built on first use; model/pipeline setup is far costlier than per-page work
+_CONVERTER = None
+
+def _get_converter():
+    """Return the process-wide docling DocumentConverter, creating it on first call."""
+    global _CONVERTER
+    if _CONVERTER is None:
+        # docling is an optional, heavy dependency; only import it when the method is used
+        from docling.backend.pypdfium2_backend import PyPdfiumDocumentBackend
+        from docling.datamodel.base_models import InputFormat
+        from docling.datamodel.pipeline_options import PdfPipelineOptions
+        from docling.document_converter import DocumentConverter, PdfFormatOption
+
+        # pypdfium2 backend is faster and lighter than docling-parse; arXiv PDFs have
+        # selectable text, so OCR and table-structure models are not needed
+        pipeline_options = PdfPipelineOptions(do_ocr=False, do_table_structure=False)
+        _CONVERTER = DocumentConverter(format_options={
+            InputFormat.PDF: PdfFormatOption(pipeline_options=pipeline_options, backend=PyPdfiumDocumentBackend)
+        })
+    return _CONVERTER
+
 def extract_text_docling(pdf_filepath: str) -> Tuple[Optional[str], Optional[str]]:
     """
     Extract text from PDF using docling.
@@ -154,7 +235,7 @@ def extract_text_docling(pdf_filepath: str) -> Tuple[Optional[str], Optional[str
         Tuple of (text: str | None, error_message: str | None)
     """
     try:
-        doc = DocumentConverter().convert(pdf_filepath).document
+        doc = _get_converter().convert(pdf_filepath).document
         text = doc.export_to_markdown()
         logger.debug(f"Extracted text using docling: {len(text)} characters", extra={"file": os.path.basename(pdf_filepath)})
         return text, None
@@ -164,62 +245,169 @@ def extract_text_docling(pdf_filepath: str) -> Tuple[Optional[str], Optional[str
         logger.error(f"docling extraction failed: {error_msg}", extra={"file": pdf_filepath})
         return None, error_msg
 
+def _init_extract_worker(method: str) -> None:
+    """Process pool initializer; docling threads internally, so pin each worker to one thread."""
+    if method == 'docling':
+        os.environ["OMP_NUM_THREADS"] = "1"
+
+def _extract_one(pdf_filepath: str, text_save_dir: str, method: str, clean: bool = True) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Extract (and for pypdf, optionally clean) one PDF's text and write it to text_save_dir.
+    Runs in a worker process, so only the short text path travels back to the parent.
+
+    Returns:
+        Tuple of (text_filepath, error_message)
+    """
+    if method == 'pypdf':
+        text, error = extract_text_pypdf(pdf_filepath=pdf_filepath)
+        if text and clean:
+            text = clean_text(text)
+    else:
+        text, error = extract_text_docling(pdf_filepath=pdf_filepath)
+
+    if not text:
+        return None, error
+
+    text_filepath = os.path.join(text_save_dir, os.path.splitext(os.path.basename(pdf_filepath))[0] + ".txt")
+    with open(text_filepath, "w", encoding="utf-8") as f:
+        f.write(text)
+    return text_filepath, None
+
 def extract_text(metadata_dict: Dict[str, Any], pdf_save_dir: str, method: str = 'pypdf',
-                 metrics: Optional[PipelineMetrics] = None) -> None:
+                 metrics: Optional[PipelineMetrics] = None, max_workers: Optional[int] = None,
+                 clean: bool = True, to_extract: Optional[List[Tuple[Any, str, str]]] = None,
+                 text_save_dir: Optional[str] = None) -> None:
     """
-    Populates the passed metadata_dict with full paper texts.
+    Extracts full paper texts and records where they were saved in the passed metadata_dict.
+
+    PDFs are extracted in parallel across a process pool since both backends are
+    CPU-bound per file. Each text is written to `<arxiv_id>.txt` in text_save_dir and the
+    path stored under 'full_text_path', keeping the metadata dict (and its JSON) small;
+    load the text back with utils.read_full_text. 'text_format' and 'text_cleaned' record
+    whether the saved text still needs clean_text.
 
     Args:
         metadata_dict: Dictionary of paper metadata
         pdf_save_dir: Directory containing downloaded PDFs
         method: Extraction method ('pypdf' or 'docling')
         metrics: Optional PipelineMetrics object for tracking
+        max_workers: Number of worker processes (defaults to os.cpu_count(), or DOCLING_MAX_WORKERS
+            for docling); never more than the number of PDFs
+        clean: Run clean_text on pypdf output; skip when the text only feeds a tokenizer.
+            docling markdown is never cleaned (see CLEANED_FORMATS)
+        to_extract: Optional pre-resolved list of (paper_id, arxiv_id, pdf_filepath) for PDFs
+            known to be on disk; skips the per-paper path building and existence checks
+        text_save_dir: Directory the .txt files are written to (defaults to pdf_save_dir).
+            Keep it outside the PDF directory if PDFs are pruned, or full_text_path dangles
     """
-    # extract text from each downloaded PDF
-    for paper_id, info in metadata_dict.items():
-        pdf_url = info.get("pdf_url")
-        if not pdf_url:
-            continue
+    if method not in TEXT_FORMATS:
+        raise ValueError(f"Unknown text extraction method '{method}'. Valid options: 'pypdf', 'docling'")
 
-        arxiv_id = pdf_url.split('/')[-1]
-        pdf_filename = f"{arxiv_id}.pdf"
-        pdf_filepath = os.path.join(pdf_save_dir, pdf_filename)
+    # collect the downloaded PDFs to extract
+    if to_extract is not None:
+        jobs = to_extract
+    else:
+        jobs = []
+        for paper_id, info in metadata_dict.items():
+            pdf_filename = info.get("pdf_filename")
+            if not pdf_filename:
+                continue
 
-        if not os.path.exists(pdf_filepath):
-            logger.warning(f"PDF not found for text extraction", extra={"arxiv_id": arxiv_id, "file": pdf_filepath})
-            continue
+            arxiv_id = pdf_filename[:-4]
+            pdf_filepath = os.path.join(pdf_save_dir, pdf_filename)
 
-        if metrics:
-            metrics.increment("scraping.text_extraction_attempted")
-
-        # Extract text based on method
-        text, error = None, None
-        if method == 'pypdf':
-            text, error = extract_text_pypdf(pdf_filepath=pdf_filepath)
-            if text:
-                text = clean_text(text)
-        elif method == 'docling':
-            text, error = extract_text_docling(pdf_filepath=pdf_filepath)
-        else:
-            raise ValueError(f"Unknown text extraction method '{method}'. Valid options: 'pypdf', 'docling'")
+            if not os.path.exists(pdf_filepath):
+                logger.warning(f"PDF not found for text extraction", extra={"arxiv_id": arxiv_id, "file": pdf_filepath})
+                continue
+
+            jobs.append((paper_id, arxiv_id, pdf_filepath))
+
+    if not jobs:
+        return
+
+    if metrics:
+        metrics.increment("scraping.text_extraction_attempted", len(jobs))
+
+    text_save_dir = text_save_dir or pdf_save_dir
+    os.makedirs(text_save_dir, exist_ok=True)
+
+    text_format = TEXT_FORMATS[method]
+    text_cleaned = text_format in CLEANED_FORMATS or clean
+
+    # the pool forks all its workers up front, so don't start more than there are PDFs
+    default_workers = DOCLING_MAX_WORKERS if method == 'docling' else (os.cpu_count() or 1)
+    num_workers = min(len(jobs), max_workers or default_workers)
+
+    with ProcessPoolExecutor(max_workers=num_workers,
+                             initializer=_init_extract_worker, initargs=(method,)) as ex:
+        futures = {ex.submit(_extract_one, pdf_filepath, text_save_dir, method, clean): (paper_id, arxiv_id, pdf_filepath)
+                   for paper_id, arxiv_id, pdf_filepath in jobs}
+
+        for future in as_completed(futures):
+            paper_id, arxiv_id, pdf_filepath = futures[future]
+            try:
+                text_filepath, error = future.result()
+            except Exception as e:
+                text_filepath, error = None, f"{type(e).__name__}: {str(e)}"
+
+            # Track results
+            metadata_dict[paper_id]['full_text_path'] = text_filepath
+            if text_filepath:
+                metadata_dict[paper_id]['text_format'] = text_format
+                metadata_dict[paper_id]['text_cleaned'] = text_cleaned
+                if metrics:
+                    metrics.increment("scraping.text_extraction_succeeded")
+            else:
+                if metrics:
+                    metrics.increment("scraping.text_extraction_failed")
+                    metrics.record_error(
+                        ErrorCategory.SCRAPING_ERROR,
+                        f"Text extraction failed: {error or 'Unknown error'}",
+                        {"arxiv_id": arxiv_id, "paper_id": paper_id, "method": method, "file": pdf_filepath}
+                    )
+
+# Columnar layout of a metadata batch; one row per paper
+_METADATA_SCHEMA = pa.schema([
+    ("paper_id", pa.int64()),
+    ("uuid", pa.string()),
+    ("title", pa.string()),
+    ("date_submitted", pa.string()),
+    ("date_scraped", pa.float64()),
+    ("tags", pa.string()),
+    ("authors", pa.string()),
+    ("abstract", pa.string()),
+    ("pdf_url", pa.string()),
+    ("pdf_filename", pa.string()),
+    ("full_arxiv_url", pa.string()),
+    ("full_text_path", pa.string()),
+    ("text_format", pa.string()),
+    ("text_cleaned", pa.bool_()),
+])
+
+def save_metadata_table(metadata_dict: Dict[int, Dict[str, Any]], filepath: str) -> None:
+    """
+    Write a metadata batch to a Parquet file, one column per field.
+
+    Columnar companion to the metadata JSON: field names are stored once in the schema
+    rather than repeated per paper, and analytics can read single columns (e.g. titles)
+    without loading whole records.
+
+    Args:
+        metadata_dict: Dictionary mapping paper_id to metadata
+        filepath: Destination .parquet path
+    """
+    fields = _METADATA_SCHEMA.names[1:]
+    columns = {name: [] for name in _METADATA_SCHEMA.names}
+    for paper_id, info in metadata_dict.items():
+        columns["paper_id"].append(int(paper_id))
+        for name in fields:
+            columns[name].append(info.get(name))
+
+    pq.write_table(pa.Table.from_pydict(columns, schema=_METADATA_SCHEMA), filepath)
 
-        # Track results
-        if text:
-            metadata_dict[paper_id]['full_text'] = text
-            if metrics:
-                metrics.increment("scraping.text_extraction_succeeded")
-        else:
-            metadata_dict[paper_id]['full_text'] = None
-            if metrics:
-                metrics.increment("scraping.text_extraction_failed")
-                metrics.record_error(
-                    ErrorCategory.SCRAPING_ERROR,
-                    f"Text extraction failed: {error or 'Unknown error'}",
-                    {"arxiv_id": arxiv_id, "paper_id": paper_id, "method": method, "file": pdf_filepath}
-                )
-    
 def scrape_papers(query: str, date: str, max_results: int = 2, method: str = 'pypdf',
-                  metrics: Optional[PipelineMetrics] = None, verbose: bool = False) -> Tuple[int, int]:
+                  metrics: Optional[PipelineMetrics] = None, verbose: bool = False,
+                  clean: bool = True) -> Tuple[int, int]:
     """
     Scrape papers from arXiv, download PDFs, and extract text.
 
@@ -230,6 +418,7 @@ def scrape_papers(query: str, date: str, max_results: int = 2, method: str = 'py
         method: Text extraction method ('pypdf' or 'docling')
         metrics: Optional PipelineMetrics object for tracking
         verbose: Enable verbose logging
+        clean: Normalize extracted text with clean_text (pypdf method only)
 
     Returns:
         Tuple of (num_metadata_fetched, num_pdfs_downloaded)
@@ -242,6 +431,8 @@ def scrape_papers(query: str, date: str, max_results: int = 2, method: str = 'py
         raise ValueError("Date must be in the form YYYY-MM-DD")
 
     pdf_save_dir = f"./data/pdfs/papers_{date_clean}"
+    # texts live outside the PDF dir, which main.clean_papers deletes after 7 days
+    text_save_dir = f"./data/texts/{date_clean}"
     logger.info(f"Starting paper scraping", extra={"query": query, "max_results": max_results, "date": date_clean, "save_dir": pdf_save_dir})
     os.makedirs(pdf_save_dir, exist_ok=True)
 
@@ -249,9 +440,44 @@ def scrape_papers(query: str, date: str, max_results: int = 2, method: str = 'py
     if metrics:
         metrics.increment("scraping.papers_requested", max_results)
 
-    # get metadata from arXiv
+    # stream metadata from arXiv, starting each PDF download as soon as its entry is parsed
     logger.info(f"Fetching metadata from arXiv", extra={"query": query, "max_results": max_results})
-    metadata_dict, api_errors = get_arxiv_metadata(query=query, max_results=max_results)
+    metadata_dict = {}
+    api_errors = []
+    num_pdfs_downloaded = 0
+    to_download = []
+    to_extract = []     # (paper_id, arxiv_id, pdf_filepath) of PDFs on disk, stat'd once here
+    pdf_paths = {}
+
+    async def pending_downloads():
+        nonlocal num_pdfs_downloaded
+        entries = iter_arxiv_metadata(query=query, max_results=max_results, errors=api_errors)
+        # parsing blocks on the socket, so pull entries in a worker thread
+        while (item := await asyncio.to_thread(next, entries, None)) is not None:
+            paper_id, info = item
+            metadata_dict[paper_id] = info
+            pdf_url = info.get("pdf_url")
+            pdf_filename = info.get("pdf_filename")
+
+            if not pdf_url:
+                logger.warning(f"No PDF URL for paper", extra={"paper_id": paper_id})
+                continue
+
+            arxiv_id = pdf_filename[:-4]
+            pdf_filepath = os.path.join(pdf_save_dir, pdf_filename)
+
+            # Check if PDF already exists
+            if os.path.exists(pdf_filepath):
+                logger.debug(f"PDF already exists, skipping download", extra={"arxiv_id": arxiv_id})
+                num_pdfs_downloaded += 1
+                to_extract.append((paper_id, arxiv_id, pdf_filepath))
+                continue
+
+            pdf_paths[paper_id] = (arxiv_id, pdf_filepath)
+            to_download.append((paper_id, pdf_url))
+            yield paper_id, pdf_url, pdf_filename
+
+    download_results = asyncio.run(download_pdfs(pending_downloads(), pdf_save_dir))
     num_papers_metadata = len(metadata_dict.keys())
 
     # Record any API errors
@@ -268,36 +494,15 @@ def scrape_papers(query: str, date: str, max_results: int = 2, method: str = 'py
 
     logger.info(f"Fetched {num_papers_metadata} papers from arXiv")
 
-    # download PDFs
-    num_pdfs_downloaded = 0
-    for paper_id, info in metadata_dict.items():
-        pdf_url = info.get("pdf_url")
-
-        if not pdf_url:
-            logger.warning(f"No PDF URL for paper", extra={"paper_id": paper_id})
-            continue
-
-        arxiv_id = pdf_url.split('/')[-1]
-        pdf_filename = f"{arxiv_id}.pdf"
-        pdf_filepath = os.path.join(pdf_save_dir, pdf_filename)
-
-        # Check if PDF already exists
-        if os.path.exists(pdf_filepath):
-            logger.debug(f"PDF already exists, skipping download", extra={"arxiv_id": arxiv_id})
-            num_pdfs_downloaded += 1
-            continue
-
-        if metrics:
-            metrics.increment("scraping.pdfs_attempted")
-
-        # Rate limiting: arXiv recommends 3-second delay between requests
-        time.sleep(3)
+    if metrics:
+        metrics.increment("scraping.pdfs_attempted", len(to_download))
 
-        # Download PDF
-        success, error_msg = download_pdf(pdf_url, pdf_save_dir)
+    for paper_id, pdf_url in to_download:
+        success, error_msg = download_results[paper_id]
 
         if success:
             num_pdfs_downloaded += 1
+            to_extract.append((paper_id, *pdf_paths[paper_id]))
             if metrics:
                 metrics.increment("scraping.pdfs_downloaded")
         else:
@@ -306,28 +511,42 @@ def scrape_papers(query: str, date: str, max_results: int = 2, method: str = 'py
                 metrics.record_error(
                     ErrorCategory.SCRAPING_ERROR,
                     f"PDF download failed: {error_msg}",
-                    {"arxiv_id": arxiv_id, "paper_id": paper_id, "url": pdf_url}
+                    {"arxiv_id": pdf_paths[paper_id][0], "paper_id": paper_id, "url": pdf_url}
                 )
 
     logger.info(f"Downloaded {num_pdfs_downloaded}/{num_papers_metadata} PDFs")
 
     # extract text from each downloaded PDF
     logger.info(f"Extracting text using {method} method")
-    extract_text(metadata_dict=metadata_dict, pdf_save_dir=pdf_save_dir, method=method, metrics=metrics)
+    extract_text(metadata_dict=metadata_dict, pdf_save_dir=pdf_save_dir, method=method, metrics=metrics,
+                 clean=clean, to_extract=to_extract, text_save_dir=text_save_dir)
 
     # Count successful extractions
-    num_with_text = sum(1 for info in metadata_dict.values() if info.get('full_text'))
+    num_with_text = sum(1 for info in metadata_dict.values() if info.get('full_text_path'))
     logger.info(f"Extracted text from {num_with_text}/{num_pdfs_downloaded} PDFs")
 
     # save results from Python dict to JSON
     os.makedirs("./data/metadata", exist_ok=True)
     metadata_file = f"./data/metadata/metadata_{date_clean}.json"
 
-    with open(metadata_file, "w") as f:
-        json.dump(metadata_dict, f, indent=2)
+    # orjson serializes in C; paper ids are ints, hence OPT_NON_STR_KEYS
+    with open(metadata_file, "wb") as f:
+        f.write(orjson.dumps(metadata_dict, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
 
     logger.info(f"Saved metadata to {metadata_file}")
 
+    # columnar copy for analytics, e.g. metadata_2026-02-01.parquet
+    metadata_table_file = f"./data/metadata/metadata_{date_clean}.parquet"
+    try:
+        save_metadata_table(metadata_dict, metadata_table_file)
+        logger.info(f"Saved metadata table to {metadata_table_file}")
+
+    except Exception as e:
+        error_msg = f"Failed to save metadata table: {type(e).__name__}: {str(e)}"
+        logger.error(error_msg, extra={"file": metadata_table_file})
+        if metrics:
+            metrics.record_error(ErrorCategory.VALIDATION_ERROR, error_msg, {"file": metadata_table_file})
+
     return num_papers_metadata, num_pdfs_downloaded
     
     
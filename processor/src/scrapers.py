@@ -5,21 +5,403 @@ Contains functions to get relevant research papers from the web. Currently can q
 
 Last updated: Feb 2026
 '''
+import os
+import re
+import json
 import time
+import shutil
+import contextlib
+import functools
 import uuid
-import feedparser # parse/extract from RSS and Atom feeds
-import urllib.request # opening URLs
-import urllib.error
+import hashlib
+import asyncio
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib.parse import quote_plus
+from lxml import etree # C-based XML parsing of the Atom feed
 
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Iterator, Optional
 from src.logger_config import get_logger
 
 logger = get_logger(__name__)
 
+# XML namespaces used by the arXiv Atom API
+ATOM_NS = {
+    'a': 'http://www.w3.org/2005/Atom',
+    'arxiv': 'http://arxiv.org/schemas/atom',
+}
+
+# Per-entry lookups compiled once; Clark-notation tags skip prefix resolution on every call
+_ATOM = f"{{{ATOM_NS['a']}}}"
+_ENTRY_TAG = f"{_ATOM}entry"
+_ID_TAG = f"{_ATOM}id"
+_TITLE_TAG = f"{_ATOM}title"
+_PUBLISHED_TAG = f"{_ATOM}published"
+_SUMMARY_TAG = f"{_ATOM}summary"
+_XP_TAGS = etree.XPath('a:category/@term', namespaces=ATOM_NS)
+_XP_ABS_URL = etree.XPath('a:link[@rel="alternate"]/@href', namespaces=ATOM_NS)
+_XP_PDF_URL = etree.XPath('a:link[@title="pdf"][@rel="related"]/@href', namespaces=ATOM_NS)
+_XP_AUTHORS = etree.XPath('a:author/a:name/text()', namespaces=ATOM_NS)
+
+# On-disk cache of raw API responses, keyed by (query, max_results)
+ARXIV_CACHE_DIR = "./data/cache/arxiv"
+ARXIV_CACHE_TTL = 3600  # seconds
+
+def _build_session() -> requests.Session:
+    """HTTP session with keep-alive pooling and retry/backoff on transient arXiv errors."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(total=3, backoff_factor=1, status_forcelist=(429, 500, 502, 503, 504)),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    # requests' default Accept-Encoding already offers gzip (~5x smaller Atom feeds); readers
+    # set raw.decode_content so the stream is inflated on the fly
+    return session
+
+# One session per process so repeated API and PDF requests reuse TCP/TLS connections
+_SESSION = _build_session()
+
+def get_session() -> requests.Session:
+    """Shared HTTP session for all arXiv requests."""
+    return _SESSION
+
+class RateLimiter:
+    """
+    Async limiter that spaces request start times at least `interval` seconds apart.
+
+    Shared by concurrent tasks so arXiv's ~3s between-requests guidance holds no matter
+    how many requests are in flight. Create one per event loop.
+    """
+
+    def __init__(self, interval: float = 3.0):
+        self.interval = interval
+        self._lock = asyncio.Lock()
+        self._next_allowed = 0.0
+
+    async def wait(self) -> None:
+        """Block until the next request slot is available."""
+        async with self._lock:
+            now = time.monotonic()
+            if self._next_allowed > now:
+                await asyncio.sleep(self._next_allowed - now)
+            self._next_allowed = max(now, self._next_allowed) + self.interval
+
+def _cache_path(query: str, max_results: int) -> str:
+    """Cache file for a (query, max_results) request."""
+    key = hashlib.blake2b(f"{query}\n{max_results}".encode(), digest_size=16).hexdigest()
+    return os.path.join(ARXIV_CACHE_DIR, f"{key}.xml")
+
+def _cache_is_fresh(cache_path: str) -> bool:
+    """True if the cache file exists and is younger than ARXIV_CACHE_TTL."""
+    try:
+        return time.time() - os.path.getmtime(cache_path) < ARXIV_CACHE_TTL
+    except OSError:
+        return False
+
+def _validators_path(cache_path: str) -> str:
+    """Sidecar file holding the ETag / Last-Modified a cache file was served with."""
+    return os.path.splitext(cache_path)[0] + ".json"
+
+def _conditional_headers(cache_path: Optional[str]) -> Dict[str, str]:
+    """If-None-Match / If-Modified-Since headers for revalidating a stale cache file."""
+    if not cache_path or not os.path.exists(cache_path):
+        return {}
+    try:
+        with open(_validators_path(cache_path), "r") as f:
+            validators = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    headers = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+class _CachingReader:
+    """
+    File-like wrapper that copies everything read from an HTTP response into a cache file.
+
+    Lets the parser keep streaming from the socket while the body is saved. The copy is
+    written to `<cache_path>.part` and only moved into place by commit(), so an
+    interrupted or unparseable response never becomes a cache hit. The response's ETag
+    and Last-Modified are saved alongside so the entry can be revalidated once stale.
+    """
+
+    def __init__(self, response, cache_path: str, headers: Optional[Dict[str, str]] = None):
+        self._response = response
+        self._cache_path = cache_path
+        self._validators = {
+            "etag": (headers or {}).get("ETag"),
+            "last_modified": (headers or {}).get("Last-Modified"),
+        }
+        self._tmp_path = cache_path + ".part"
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        self._sink = open(self._tmp_path, "wb")
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._response.read(size)
+        self._sink.write(data)
+        return data
+
+    def commit(self) -> None:
+        """Save whatever the parser left unread, then publish the body as the cache entry."""
+        shutil.copyfileobj(self._response, self._sink)
+        self._sink.close()
+        os.replace(self._tmp_path, self._cache_path)
+        with open(_validators_path(self._cache_path), "w") as f:
+            json.dump(self._validators, f)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._response.close()
+        if not self._sink.closed:
+            self._sink.close()
+            os.remove(self._tmp_path)
+
+@functools.lru_cache(maxsize=1024)
 def date_conv(date_str):
     year, month, day = date_str.split("-")
     return f"{year}{month}{day}0000"
 
+# trailing version suffix of an arXiv id, e.g. the "v2" in 2401.01234v2
+_VERSION_RE = re.compile(r"v\d+$")
+
+def _arxiv_identifiers(arxiv_id: str) -> Dict[str, str]:
+    """
+    Derive a paper's uuid, PDF URL and PDF filename from its arXiv id, so the Atom and
+    OAI-PMH parsers agree on them and a paper seen through both is stored once.
+
+    Args:
+        arxiv_id: arXiv id with or without version (e.g., "2401.01234v2", "hep-th/9901001")
+
+    Returns:
+        Dictionary with "uuid" and "pdf_filename" keyed on the unversioned id, and
+        "pdf_url" pinned to the version when one is given
+    """
+    base_id = _VERSION_RE.sub("", arxiv_id)
+    return {
+        "uuid": str(uuid.uuid5(uuid.NAMESPACE_URL, f"http://arxiv.org/abs/{base_id}")),
+        "pdf_url": f"http://arxiv.org/pdf/{arxiv_id}",
+        "pdf_filename": f"{base_id.replace('/', '_')}.pdf",
+    }
+
+def _parse_entry(entry) -> Dict[str, Any]:
+    """
+    Build a metadata record from one Atom <entry> element.
+
+    Args:
+        entry: lxml element for the entry
+
+    Returns:
+        Metadata dictionary for the paper
+    """
+    # get relevant info from the Atom entry
+    # Atom wraps long titles across lines; collapse whitespace to match the OAI-PMH records
+    title = " ".join((entry.findtext(_TITLE_TAG) or "Unknown Title").split())
+    published = entry.findtext(_PUBLISHED_TAG)
+    date_submitted = published[:10] if published else None
+    tags = ', '.join(_XP_TAGS(entry)) or None
+    abstract = (entry.findtext(_SUMMARY_TAG, "")).strip()
+
+    abs_urls = _XP_ABS_URL(entry)
+    full_arxiv_url = abs_urls[0] if abs_urls else None
+    entry_id = (entry.findtext(_ID_TAG) or full_arxiv_url or "").strip()
+
+    # arXiv PDFs live at the abs URL with /abs/ -> /pdf/, so skip the link scan when we can
+    if "/abs/" in entry_id:
+        ids = _arxiv_identifiers(entry_id.partition("/abs/")[2])
+    else:
+        pdf_urls = _XP_PDF_URL(entry)
+        pdf_url = pdf_urls[0] if pdf_urls else None
+        ids = {
+            "uuid": str(uuid.uuid4()),
+            "pdf_url": pdf_url,
+            "pdf_filename": pdf_url.rpartition('/')[2] + ".pdf" if pdf_url else None,
+        }
+
+    authors = ', '.join(_XP_AUTHORS(entry)) or None
+
+    return {
+        "uuid": ids["uuid"],
+        "title": title,
+        "date_submitted": date_submitted,
+        "date_scraped": time.time(),
+        "tags": tags,
+        "authors": authors,
+        "abstract": abstract,
+        "pdf_url": ids["pdf_url"],
+        "pdf_filename": ids["pdf_filename"],
+        "full_arxiv_url": full_arxiv_url,
+        "full_text_path": None
+    }
+
+def iter_arxiv_metadata(query: str, max_results: int = 2, errors: Optional[List[Dict[str, Any]]] = None,
+                        use_cache: bool = True, id_list: Optional[str] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Stream paper metadata from the arXiv API, yielding each entry as soon as it is parsed.
+
+    The response body is fed to lxml's iterparse straight off the socket, so callers can
+    start work on the first papers (e.g. PDF downloads) while the rest of the feed is
+    still arriving. Responses are cached on disk for ARXIV_CACHE_TTL seconds per
+    (query, max_results), so re-runs and retries skip the network round-trip; after that
+    the cached copy is revalidated with a conditional GET and reused on 304.
+
+    Args:
+        query: arXiv category query (e.g., "cs.AI")
+        max_results: Maximum number of papers to fetch
+        errors: Optional list that error dictionaries are appended to
+        use_cache: Read and write the on-disk response cache
+        id_list: Comma-separated arXiv ids to look up instead of searching `query`
+
+    Yields:
+        Tuples of (paper_id, metadata_dict)
+    """
+    if errors is None:
+        errors = []
+
+    # percent-encode the query in one pass (spaces -> '+', '&' etc. escaped), keeping field prefixes like cat:
+    query = quote_plus(query, safe=":")
+
+    if id_list:
+        query = f"id:{id_list}"
+        api_url = f"https://export.arxiv.org/api/query?id_list={id_list}&max_results={max_results}"
+    else:
+        api_url = f"https://export.arxiv.org/api/query?search_query=cat:{query}&sortBy=submittedDate&max_results={max_results}"
+    logger.info(f"Querying arXiv API", extra={"query": query, "max_results": max_results, "url": api_url})
+
+    # serve a recent identical request from the on-disk cache, otherwise fetch from arXiv
+    cache_path = _cache_path(query, max_results) if use_cache else None
+    if cache_path and _cache_is_fresh(cache_path):
+        logger.info(f"Using cached arXiv response", extra={"query": query, "max_results": max_results, "file": cache_path})
+        # hand lxml the path itself so libxml2 reads the file in C, with no Python file object
+        url = contextlib.nullcontext(cache_path)
+    else:
+        try:
+            response = _SESSION.get(api_url, timeout=30, stream=True, headers=_conditional_headers(cache_path))
+            if response.status_code != 304:
+                response.raise_for_status()
+                # read the body straight off the socket, undoing any gzip transfer encoding
+                response.raw.decode_content = True
+
+        except requests.exceptions.HTTPError as e:
+            e.response.close()
+            error_msg = f"HTTP {e.response.status_code}: {e.response.reason}"
+            logger.error(f"arXiv API HTTP error: {error_msg}", extra={"query": query, "url": api_url})
+            errors.append({
+                "type": "HTTPError",
+                "message": error_msg,
+                "query": query,
+                "url": api_url
+            })
+            return
+
+        except requests.exceptions.Timeout as e:
+            error_msg = "Request timeout (30s)"
+            logger.error(f"arXiv API timeout", extra={"query": query, "url": api_url})
+            errors.append({
+                "type": "TimeoutError",
+                "message": error_msg,
+                "query": query,
+                "url": api_url
+            })
+            return
+
+        except requests.exceptions.ConnectionError as e:
+            error_msg = f"Connection Error: {e}"
+            logger.error(f"arXiv API connection error: {error_msg}", extra={"query": query, "url": api_url})
+            errors.append({
+                "type": "ConnectionError",
+                "message": error_msg,
+                "query": query,
+                "url": api_url
+            })
+            return
+
+        except Exception as e:
+            error_msg = f"{type(e).__name__}: {str(e)}"
+            logger.error(f"arXiv API unexpected error: {error_msg}", extra={"query": query, "url": api_url})
+            errors.append({
+                "type": type(e).__name__,
+                "message": error_msg,
+                "query": query,
+                "url": api_url
+            })
+            return
+
+        if response.status_code == 304:
+            # feed unchanged since the cached copy was saved; restart its TTL and parse it from disk
+            response.close()
+            logger.info(f"arXiv feed not modified, using cached response", extra={"query": query, "file": cache_path})
+            with contextlib.suppress(OSError):
+                os.utime(cache_path)
+            url = contextlib.nullcontext(cache_path)
+        else:
+            url = response.raw
+            if cache_path:
+                try:
+                    url = _CachingReader(url, cache_path, response.headers)
+                except OSError as e:
+                    # caching is best-effort; an unwritable cache dir must not fail the fetch
+                    logger.warning(f"Could not open arXiv cache file: {e}", extra={"file": cache_path})
+
+    # parse response incrementally, one <entry> at a time
+    paper_num = 0
+    with url as source:
+        try:
+            for _, entry in etree.iterparse(source, events=("end",), tag=_ENTRY_TAG):
+                try:
+                    record = _parse_entry(entry)
+                except Exception as e:
+                    record = None
+                    error_msg = f"Failed to parse entry: {type(e).__name__}: {str(e)}"
+                    logger.warning(f"Error parsing paper entry", extra={"paper_num": paper_num, "error": error_msg})
+                    errors.append({
+                        "type": "EntryParseError",
+                        "message": error_msg,
+                        "paper_num": paper_num
+                    })
+
+                # the record holds copies of everything needed; drop the entry and any
+                # earlier siblings so the tree stays O(1) in the number of entries
+                entry.clear()
+                while entry.getprevious() is not None:
+                    del entry.getparent()[0]
+
+                if record is None:
+                    continue
+
+                yield paper_num, record
+                paper_num += 1
+
+                # arXiv can return more entries than requested; stop parsing at the cap
+                if paper_num >= max_results:
+                    break
+
+            # only a complete, non-empty feed is worth serving again
+            if paper_num and isinstance(url, _CachingReader):
+                url.commit()
+
+        except Exception as e:
+            # a broken or truncated feed keeps the entries parsed before the failure
+            error_msg = f"Feed parsing error: {type(e).__name__}: {str(e)}"
+            logger.error(f"Failed to parse arXiv response", extra={"error": error_msg})
+            errors.append({
+                "type": "ParseError",
+                "message": error_msg,
+                "query": query
+            })
+
+    if paper_num == 0:
+        logger.warning(f"No papers found for query", extra={"query": query})
+
 def get_arxiv_metadata(query: str, max_results: int = 2) -> Tuple[Dict[int, Dict[str, Any]], List[Dict[str, Any]]]:
     """
     Fetch paper metadata from arXiv API.
@@ -34,138 +416,288 @@ def get_arxiv_metadata(query: str, max_results: int = 2) -> Tuple[Dict[int, Dict
         - errors_list: List of error dictionaries with context
     """
     errors = []
+    records = dict(iter_arxiv_metadata(query, max_results, errors))
 
-    if " " in query:
-        query = query.replace(" ", "+")
+    logger.info(f"Successfully parsed {len(records)} papers")
 
-    api_url = f"http://export.arxiv.org/api/query?search_query=cat:{query}&sortBy=submittedDate&max_results={max_results}"
-    logger.info(f"Querying arXiv API", extra={"query": query, "max_results": max_results, "url": api_url})
+    return records, errors
 
-    # fetch from arXiv 
-    try:
-        with urllib.request.urlopen(api_url, timeout=30) as url:
-            response = url.read()
-            logger.debug(f"arXiv API response received", extra={"size_bytes": len(response)})
-
-    except urllib.error.HTTPError as e:
-        error_msg = f"HTTP {e.code}: {e.reason}"
-        logger.error(f"arXiv API HTTP error: {error_msg}", extra={"query": query, "url": api_url})
-        errors.append({
-            "type": "HTTPError",
-            "message": error_msg,
-            "query": query,
-            "url": api_url
-        })
-        return {}, errors
-
-    except urllib.error.URLError as e:
-        error_msg = f"URL Error: {e.reason}"
-        logger.error(f"arXiv API URL error: {error_msg}", extra={"query": query, "url": api_url})
-        errors.append({
-            "type": "URLError",
-            "message": error_msg,
-            "query": query,
-            "url": api_url
-        })
-        return {}, errors
-
-    except TimeoutError as e:
-        error_msg = "Request timeout (30s)"
-        logger.error(f"arXiv API timeout", extra={"query": query, "url": api_url})
-        errors.append({
-            "type": "TimeoutError",
-            "message": error_msg,
-            "query": query,
-            "url": api_url
-        })
-        return {}, errors
-
-    except Exception as e:
-        error_msg = f"{type(e).__name__}: {str(e)}"
-        logger.error(f"arXiv API unexpected error: {error_msg}", extra={"query": query, "url": api_url})
-        errors.append({
-            "type": type(e).__name__,
-            "message": error_msg,
-            "query": query,
-            "url": api_url
-        })
-        return {}, errors
-
-    # parse response
-    try:
-        feed = feedparser.parse(response)
-    except Exception as e:
-        error_msg = f"Feed parsing error: {type(e).__name__}: {str(e)}"
-        logger.error(f"Failed to parse arXiv response", extra={"error": error_msg})
-        errors.append({
-            "type": "ParseError",
-            "message": error_msg,
-            "query": query
-        })
-        return {}, errors
-
-    # check for empty results
-    if not hasattr(feed, 'entries') or len(feed.entries) == 0:
-        logger.warning(f"No papers found for query", extra={"query": query})
-        return {}, errors
+def get_arxiv_metadata_single(arxiv_id: str) -> Dict[int, Dict[str, Any]]:
+    """
+    Fetch metadata for one specific paper by its arXiv id.
+
+    Args:
+        arxiv_id: arXiv identifier (e.g., "2401.01234" or "hep-th/9901001")
+
+    Returns:
+        Dictionary mapping paper_id to metadata, with the paper under key 0
+
+    Raises:
+        RuntimeError: If the lookup failed or arXiv returned no entry for the id
+    """
+    errors = []
+    records = dict(iter_arxiv_metadata(arxiv_id, 1, errors, id_list=arxiv_id))
+
+    if not records:
+        # surface the failure instead of letting callers index into an empty dict
+        reason = errors[0]["message"] if errors else "no entry returned"
+        raise RuntimeError(f"arXiv lookup for {arxiv_id} failed: {reason}")
+
+    return records
+
+async def gather_arxiv_metadata(queries: List[str], max_results: int = 2, concurrency: int = 4,
+                                interval: float = 3.0) -> Dict[str, Tuple[Dict[int, Dict[str, Any]], List[Dict[str, Any]]]]:
+    """
+    Fetch metadata for several arXiv queries concurrently.
+
+    Each query runs get_arxiv_metadata in a worker thread. A BoundedSemaphore caps the
+    requests in flight and a shared RateLimiter keeps request starts `interval` seconds
+    apart, so N categories cost roughly one round-trip plus the spacing instead of N
+    serial round-trips.
+
+    Args:
+        queries: arXiv category queries (e.g., ["cs.AI", "cs.CL"])
+        max_results: Maximum number of papers to fetch per query
+        concurrency: Maximum number of API requests in flight
+        interval: Minimum seconds between request starts (arXiv asks for 3)
+
+    Returns:
+        Dictionary mapping each query to get_arxiv_metadata's (records_dict, errors_list)
+    """
+    sem = asyncio.BoundedSemaphore(concurrency)
+    limiter = RateLimiter(interval)
+
+    async def fetch(query):
+        async with sem:
+            await limiter.wait()
+            return await asyncio.to_thread(get_arxiv_metadata, query, max_results)
+
+    results = await asyncio.gather(*(fetch(query) for query in queries))
+    return dict(zip(queries, results))
+
+def get_arxiv_metadata_batch(queries: List[str], max_results: int = 2, concurrency: int = 4,
+                             interval: float = 3.0) -> Dict[str, Tuple[Dict[int, Dict[str, Any]], List[Dict[str, Any]]]]:
+    """
+    Synchronous wrapper around gather_arxiv_metadata for callers outside an event loop.
+
+    Args:
+        queries: arXiv category queries (e.g., ["cs.AI", "cs.CL"])
+        max_results: Maximum number of papers to fetch per query
+        concurrency: Maximum number of API requests in flight
+        interval: Minimum seconds between request starts (arXiv asks for 3)
+
+    Returns:
+        Dictionary mapping each query to (records_dict, errors_list)
+    """
+    return asyncio.run(gather_arxiv_metadata(queries, max_results, concurrency, interval))
+
+# arXiv OAI-PMH bulk metadata interface
+OAI_URL = "https://export.arxiv.org/oai2"
+OAI_NS = {
+    'oai': 'http://www.openarchives.org/OAI/2.0/',
+    'arXiv': 'http://arxiv.org/OAI/arXiv/',
+}
+_OAI = f"{{{OAI_NS['oai']}}}"
+_OAI_ARXIV = f"{{{OAI_NS['arXiv']}}}"
+_OAI_RECORD_TAG = f"{_OAI}record"
+_OAI_TOKEN_TAG = f"{_OAI}resumptionToken"
+_OAI_ERROR_TAG = f"{_OAI}error"
+_XP_OAI_AUTHORS = etree.XPath('arXiv:authors/arXiv:author', namespaces=OAI_NS)
 
-    logger.info(f"Found {len(feed.entries)} papers from arXiv")
+def _oai_cursor_path(set_spec: str, categories: Optional[List[str]]) -> str:
+    """File holding the last fully harvested datestamp for an OAI-PMH set and category filter."""
+    key = hashlib.blake2b(f"{set_spec}\n{sorted(categories or [])}".encode(), digest_size=8).hexdigest()
+    return os.path.join(ARXIV_CACHE_DIR, f"oai_cursor_{key}.json")
+
+def _parse_oai_record(record) -> Optional[Dict[str, Any]]:
+    """
+    Build a metadata record from one OAI-PMH <record> in the arXiv metadata format.
+
+    Args:
+        record: lxml element for the record
+
+    Returns:
+        Metadata dictionary in the same shape as the Atom records, or None for deleted records
+    """
+    header = record.find(f"{_OAI}header")
+    if header is not None and header.get("status") == "deleted":
+        return None
+
+    meta = record.find(f"{_OAI}metadata/{_OAI_ARXIV}arXiv")
+    arxiv_id = meta.findtext(f"{_OAI_ARXIV}id").strip()
+    full_arxiv_url = f"http://arxiv.org/abs/{arxiv_id}"
+    ids = _arxiv_identifiers(arxiv_id)
+
+    authors = ', '.join([
+        " ".join(filter(None, (a.findtext(f"{_OAI_ARXIV}forenames"), a.findtext(f"{_OAI_ARXIV}keyname"))))
+        for a in _XP_OAI_AUTHORS(meta)
+    ]) or None
+
+    return {
+        "uuid": ids["uuid"],
+        "title": " ".join((meta.findtext(f"{_OAI_ARXIV}title") or "Unknown Title").split()),
+        "date_submitted": meta.findtext(f"{_OAI_ARXIV}created"),
+        "date_scraped": time.time(),
+        "tags": ', '.join((meta.findtext(f"{_OAI_ARXIV}categories") or "").split()) or None,
+        "authors": authors,
+        "abstract": (meta.findtext(f"{_OAI_ARXIV}abstract") or "").strip(),
+        "pdf_url": ids["pdf_url"],
+        "pdf_filename": ids["pdf_filename"],
+        "full_arxiv_url": full_arxiv_url,
+        "full_text_path": None
+    }
+
+def iter_oai_metadata(set_spec: str = "cs", categories: Optional[List[str]] = None,
+                      from_date: Optional[str] = None, errors: Optional[List[Dict[str, Any]]] = None,
+                      interval: float = 3.0) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Stream recent paper metadata for many categories through arXiv's OAI-PMH ListRecords.
+
+    One harvest of a top-level set (e.g. "cs") replaces an Atom query per category: pages
+    are followed via resumption tokens, and 429/503 flow-control replies are retried after
+    their Retry-After delay by the shared session. When a harvest completes, the newest
+    record datestamp is saved to a cursor file so the next run with no `from_date` only
+    fetches records added or updated since.
+
+    Args:
+        set_spec: OAI-PMH set to harvest (e.g., "cs", "math", "physics:hep-th")
+        categories: Optional category filter (e.g., ["cs.AI", "cs.CL"]); records in any of
+            them are kept
+        from_date: Harvest records with datestamps on/after this YYYY-MM-DD date; defaults to
+            the saved cursor
+        errors: Optional list that error dictionaries are appended to
+        interval: Seconds to wait between page requests
+
+    Yields:
+        Tuples of (paper_id, metadata_dict)
+    """
+    if errors is None:
+        errors = []
+
+    cursor_path = _oai_cursor_path(set_spec, categories)
+    if from_date is None:
+        try:
+            with open(cursor_path, "r") as f:
+                from_date = json.load(f).get("datestamp")
+        except (OSError, ValueError):
+            from_date = None
+
+    wanted = set(categories) if categories else None
+    params = {"verb": "ListRecords", "metadataPrefix": "arXiv", "set": set_spec}
+    if from_date:
+        params["from"] = from_date
+
+    logger.info(f"Harvesting arXiv OAI-PMH", extra={"set": set_spec, "from": from_date, "categories": categories})
 
-    # extract metadata from feed entries
-    records = {}
     paper_num = 0
-    for entry in feed.entries:
+    latest_datestamp = from_date
+    while True:
         try:
-            # get relevant info from feedparser and add to records dict
-            title = entry.title.strip() if hasattr(entry, 'title') else "Unknown Title"
-            date_submitted = entry.published[:10] if hasattr(entry, 'published') else None
-            tags = ', '.join(t['term'] for t in entry.tags) if hasattr(entry, 'tags') and entry.tags else None
-            abstract = entry.summary.strip() if hasattr(entry, 'summary') else ""
-
-            full_arxiv_url = entry.link if hasattr(entry, 'link') else None
-
-            pdf_url = None
-            if hasattr(entry, 'links'):
-                for link in entry.links:
-                    if link.get('title') == 'pdf' and link.get('rel') == 'related':
-                        pdf_url = link.get('href')
-                        break
-
-            authors = None
-            if hasattr(entry, 'authors'):
-                try:
-                    authors = ', '.join(author.name for author in entry.authors)
-                except AttributeError:
-                    authors = str(entry.authors) if entry.authors else None
-            elif hasattr(entry, 'author'):
-                authors = entry.author
-
-            records[paper_num] = {
-                "uuid": str(uuid.uuid4()),
-                "title": title,
-                "date_submitted": date_submitted,
-                "date_scraped": time.time(),
-                "tags": tags,
-                "authors": authors,
-                "abstract": abstract,
-                "pdf_url": pdf_url,
-                "full_arxiv_url": full_arxiv_url,
-                "full_text": None
-            }
-            paper_num += 1
+            response = _SESSION.get(OAI_URL, params=params, timeout=60, stream=True)
+            response.raise_for_status()
+            response.raw.decode_content = True
 
-        except Exception as e:
-            error_msg = f"Failed to parse entry: {type(e).__name__}: {str(e)}"
-            logger.warning(f"Error parsing paper entry", extra={"paper_num": paper_num, "error": error_msg})
+        except requests.exceptions.RequestException as e:
+            error_msg = f"{type(e).__name__}: {str(e)}"
+            logger.error(f"arXiv OAI-PMH request failed: {error_msg}", extra={"set": set_spec, "params": params})
             errors.append({
-                "type": "EntryParseError",
+                "type": type(e).__name__,
                 "message": error_msg,
-                "paper_num": paper_num
+                "set": set_spec,
+                "url": OAI_URL
             })
-            continue
+            return
 
-    logger.info(f"Successfully parsed {len(records)} papers")
+        token = None
+        with response:
+            try:
+                for _, elem in etree.iterparse(response.raw, events=("end",),
+                                               tag=(_OAI_RECORD_TAG, _OAI_TOKEN_TAG, _OAI_ERROR_TAG)):
+                    if elem.tag == _OAI_TOKEN_TAG:
+                        token = (elem.text or "").strip() or None
+                        continue
+
+                    if elem.tag == _OAI_ERROR_TAG:
+                        # an empty harvest is reported as an error code, but isn't one
+                        if elem.get("code") != "noRecordsMatch":
+                            errors.append({
+                                "type": "OAIError",
+                                "message": f"{elem.get('code')}: {(elem.text or '').strip()}",
+                                "set": set_spec
+                            })
+                        continue
+
+                    datestamp = elem.findtext(f"{_OAI}header/{_OAI}datestamp")
+                    if datestamp and (latest_datestamp is None or datestamp > latest_datestamp):
+                        latest_datestamp = datestamp
+
+                    try:
+                        record = _parse_oai_record(elem)
+                    except Exception as e:
+                        record = None
+                        error_msg = f"Failed to parse record: {type(e).__name__}: {str(e)}"
+                        logger.warning(f"Error parsing OAI record", extra={"paper_num": paper_num, "error": error_msg})
+                        errors.append({
+                            "type": "EntryParseError",
+                            "message": error_msg,
+                            "paper_num": paper_num
+                        })
+
+                    # keep the tree flat across a page of up to ~1000 records
+                    elem.clear()
+                    while elem.getprevious() is not None:
+                        del elem.getparent()[0]
+
+                    if record is None:
+                        continue
+                    if wanted and wanted.isdisjoint(record["tags"].split(", ") if record["tags"] else ()):
+                        continue
+
+                    yield paper_num, record
+                    paper_num += 1
+
+            except Exception as e:
+                error_msg = f"Feed parsing error: {type(e).__name__}: {str(e)}"
+                logger.error(f"Failed to parse OAI-PMH response", extra={"error": error_msg})
+                errors.append({
+                    "type": "ParseError",
+                    "message": error_msg,
+                    "set": set_spec
+                })
+                return
+
+        if not token:
+            break
+
+        params = {"verb": "ListRecords", "resumptionToken": token}
+        time.sleep(interval)
 
+    # the harvest finished, so the next incremental run can start from the newest datestamp
+    if latest_datestamp and not any(e["type"] == "OAIError" for e in errors):
+        try:
+            os.makedirs(os.path.dirname(cursor_path), exist_ok=True)
+            with open(cursor_path, "w") as f:
+                json.dump({"datestamp": latest_datestamp}, f)
+        except OSError as e:
+            logger.warning(f"Could not save OAI-PMH cursor: {e}", extra={"file": cursor_path})
+
+    logger.info(f"Harvested {paper_num} papers via OAI-PMH", extra={"set": set_spec})
+
+def get_oai_metadata(set_spec: str = "cs", categories: Optional[List[str]] = None,
+                     from_date: Optional[str] = None) -> Tuple[Dict[int, Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Fetch paper metadata for several categories in one OAI-PMH harvest.
+
+    Args:
+        set_spec: OAI-PMH set to harvest (e.g., "cs")
+        categories: Optional category filter (e.g., ["cs.AI", "cs.CL"])
+        from_date: Harvest records on/after this YYYY-MM-DD date; defaults to the saved cursor
+
+    Returns:
+        Tuple of (records_dict, errors_list), shaped like get_arxiv_metadata's
+    """
+    errors = []
+    records = dict(iter_oai_metadata(set_spec, categories, from_date, errors))
     return records, errors
 
 if __name__ == "__main__":
@@ -176,7 +708,7 @@ if __name__ == "__main__":
         
         assert type(records) == dict
         assert list(records.keys()) == list(range(max_results))
-        assert list(records[0].keys()) == ['uuid', 'title', 'date_submitted', 'date_scraped', 'tags', 'authors', 'abstract', 'pdf_url', 'full_arxiv_url', 'full_text']
+        assert list(records[0].keys()) == ['uuid', 'title', 'date_submitted', 'date_scraped', 'tags', 'authors', 'abstract', 'pdf_url', 'pdf_filename', 'full_arxiv_url', 'full_text_path']
         
         # working as expected; print info
         print(f"---- Number of papers scraped: {len(records)}")
@@ -184,6 +716,6 @@ if __name__ == "__main__":
         print(f"---- Keys correspond to each paper's index: {records.keys()}")
         print(f"---- Each paper is a dictionary itself too; keys: {records[0].keys()}")
         print(f"---- Example entry:\n{records[0]}")
-        print(f"\n---- NOTE: Here the 'full_text' attribute should be empty! It needs to be extracted from the pdf.")
+        print(f"\n---- NOTE: Here the 'full_text_path' attribute should be empty! The text needs to be extracted from the pdf.")
         
     test_arxiv_scraper()
\ No newline at end of file
@@ -6,9 +6,20 @@ Sep 2025
 '''
 import os
 import re
+import sys
 import json
-import subprocess
+import mmap
+import time
+import shutil
+import contextlib
+import orjson
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from src.scrapers import get_session, get_arxiv_metadata_single
+from src.logger_config import get_logger
+
+logger = get_logger(__name__)
 
 def inspect_dictionary(d, indent=0):
     """ [Written by CLAUDE Sonnet 4]
@@ -19,8 +30,18 @@ def inspect_dictionary(d, indent=0):
         d (dict): The dictionary object to inspect.
         indent (int): The current indentation level for nested dictionaries (internal use).
     """
+    out = []
+    _inspect_lines(d, indent, out)
+    # one buffered write instead of a locked print() per line
+    if out:
+        sys.stdout.write("\n".join(out) + "\n")
+
+
+def _inspect_lines(d, indent, out):
+    """Append inspect_dictionary's output lines for `d` to `out`."""
+    pad = '  ' * indent  # built once per level rather than on every line
     if not isinstance(d, dict):
-        print(f"{'  ' * indent}[ERROR] Expected dictionary, received {type(d).__name__}")
+        out.append(f"{pad}[ERROR] Expected dictionary, received {type(d).__name__}")
         return
 
     for key, value in d.items():
@@ -28,32 +49,33 @@ def inspect_dictionary(d, indent=0):
         value_type = type(value).__name__
         
         # Print key with clear visual hierarchy
-        print(f"{'  ' * indent}├─ {key} ({key_type})")
+        out.append(f"{pad}├─ {key} ({key_type})")
 
         # Handle nested dictionaries
         if isinstance(value, dict):
-            print(f"{'  ' * indent}│  └─ {value_type} with {len(value)} key(s)")
-            inspect_dictionary(value, indent + 1)
+            out.append(f"{pad}│  └─ {value_type} with {len(value)} key(s)")
+            _inspect_lines(value, indent + 1, out)
             if indent == 0:  # Add spacing after top-level nested dicts
-                print()
+                out.append("")
         
         # Handle lists and tuples
         elif isinstance(value, (list, tuple)):
-            print(f"{'  ' * indent}│  └─ {value} ({value_type}, length: {len(value)})")
+            out.append(f"{pad}│  └─ {value} ({value_type}, length: {len(value)})")
+            item_pad = '  ' * (indent + 1)
             for i, item in enumerate(value):
                 item_type = type(item).__name__
-                print(f"{'  ' * (indent + 1)}   [{i}] {item} ({item_type})")
+                out.append(f"{item_pad}   [{i}] {item} ({item_type})")
                 # Recursively inspect dictionary items in lists
                 if isinstance(item, dict):
-                    inspect_dictionary(item, indent + 2)
+                    _inspect_lines(item, indent + 2, out)
         
         # Handle simple values
         else:
-            print(f"{'  ' * indent}│  └─ {value} ({value_type})")
+            out.append(f"{pad}│  └─ {value} ({value_type})")
     
     # Add clean separation after top-level inspection
     if indent == 0:
-        print("─" * 50)
+        out.append("─" * 50)
         
 
 def clear_pdfs(date: str, clear_metadata: bool = False):
@@ -68,13 +90,19 @@ def clear_pdfs(date: str, clear_metadata: bool = False):
         raise ValueError("Invalid 'date' path: target not under ./papers")
 
     if papers_dir.exists() and papers_dir.is_dir():
-        deleted_any = False
-        for p in papers_dir.iterdir():
-            if p.is_file() and p.suffix.lower() == ".pdf":
+        # scandir reports file type from the directory entry itself, so no stat() per file
+        with os.scandir(papers_dir) as it:
+            pdf_paths = [Path(entry.path) for entry in it
+                         if entry.name.lower().endswith(".pdf") and entry.is_file(follow_symlinks=False)]
+
+        # unlinks block on the filesystem, so issue them from a small thread pool
+        with ThreadPoolExecutor(max_workers=8) as ex:
+            futures = {ex.submit(p.unlink): p for p in pdf_paths}
+            for future in as_completed(futures):
                 try:
-                    p.unlink()
-                    deleted_any = True
+                    future.result()
                 except Exception as e:
+                    p = futures[future]
                     raise RuntimeError(f"Failed to delete {p}: {e}") from e
         try:
             if not any(papers_dir.iterdir()):
@@ -103,42 +131,146 @@ def save_specific_paper(arxiv_id):
     '''
     # scrape metadata from specific papers
     metadata_dict = get_arxiv_metadata_single(arxiv_id)
-    
-    with open(f"./metadata/metadata_{metadata_dict[0]['title'].replace(' ', '')}.json", "a") as f:
-        json.dump(metadata_dict, f, indent=2)
+    safe_id = arxiv_id.replace('/', '_')
 
-        
-    # download pdf
-    subprocess.run(["arxiv-downloader", arxiv_id, "-d" "./papers/papers_core"])
+    # serialize once and swap the file in atomically; a rerun overwrites rather than appends
+    metadata_path = Path("./metadata") / f"metadata_{safe_id}.json"
+    metadata_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = metadata_path.with_suffix(".json.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(orjson.dumps(metadata_dict, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        # make the bytes durable before the rename, or a crash can leave an empty file behind
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, metadata_path)
+
+    # download pdf directly over the shared keep-alive session rather than shelling out
+    pdf_path = Path("./papers/papers_core") / f"{safe_id}.pdf"
+    pdf_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = pdf_path.with_suffix(".pdf.part")
+    try:
+        with get_session().get(f"https://arxiv.org/pdf/{arxiv_id}", stream=True, timeout=60) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            with open(tmp_path, "wb") as f:
+                shutil.copyfileobj(response.raw, f, 1 << 20)
+        os.replace(tmp_path, pdf_path)
+    except BaseException:
+        # don't leave a partial download behind
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
     
 
+def read_full_text(paper):
+    """
+    Load a paper's extracted text from the file recorded in its metadata.
+
+    Falls back to an inline 'full_text' value for metadata batches written before
+    texts were saved to per-paper files.
+
+    Args:
+        paper (dict): One paper's metadata.
+
+    Returns:
+        str | None: The full text, or None if the paper has none.
+    """
+    text_filepath = paper.get('full_text_path')
+    if text_filepath:
+        try:
+            with open(text_filepath, 'r', encoding='utf-8') as f:
+                return f.read()
+        except FileNotFoundError:
+            # the text file was recorded but is gone; say so rather than passing off as "no text"
+            logger.warning(f"Recorded full text file is missing", extra={"file": text_filepath})
+            return None
+    return paper.get('full_text')
+
+
 def load_json_file(filepath):
     """Load JSON data from file with error handling."""
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(filepath, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return orjson.loads(b"")  # raises JSONDecodeError, like json.load
+            # orjson parses the mapped bytes directly: no .read() copy and no separate
+            # UTF-8 decode pass
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                return orjson.loads(view)
     except (json.JSONDecodeError, FileNotFoundError) as e:
         raise ValueError(f"Failed to load JSON file {filepath}: {e}")
 
 
+# check_directory_exists results, {directory: (expires_at, exists)}; directories can appear
+# or vanish, so entries only live for a few seconds
+_DIR_CHECK_TTL = 5.0
+_dir_check_cache = {}
+
+
 def ensure_directory_exists(directory):
     """Ensure the specified directory exists."""
     Path(directory).mkdir(parents=True, exist_ok=True)
+    _dir_check_cache[str(directory)] = (time.monotonic() + _DIR_CHECK_TTL, True)
 
 
 def check_directory_exists(directory):
-    """Check if the specified directory exists."""
-    return Path(directory).is_dir()
+    """Check if the specified directory exists (cached for _DIR_CHECK_TTL seconds)."""
+    key = str(directory)
+    now = time.monotonic()
+    cached = _dir_check_cache.get(key)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    exists = Path(directory).is_dir()
+    _dir_check_cache[key] = (now + _DIR_CHECK_TTL, exists)
+    return exists
+
+# Captures the percentage from "<pct>% keyword extraction rate" log lines
+_KWD_RATE_SUFFIX = b'% keyword extraction rate'
+_KWD_RATE_RE = re.compile(rb'([\d.]+)' + re.escape(_KWD_RATE_SUFFIX))
+
+# Hyperscan database for the same pattern, compiled on first use; False once we know
+# hyperscan isn't installed
+_KWD_RATE_DB = None
+
+def _get_kwd_rate_db():
+    """Return the compiled Hyperscan database, or None when hyperscan is unavailable."""
+    global _KWD_RATE_DB
+    if _KWD_RATE_DB is None:
+        try:
+            import hyperscan
+        except ImportError:
+            _KWD_RATE_DB = False
+        else:
+            db = hyperscan.Database()
+            db.compile(
+                expressions=[rb'[\d.]+' + re.escape(_KWD_RATE_SUFFIX)],
+                ids=[0],
+                elements=1,
+                flags=[hyperscan.HS_FLAG_SOM_LEFTMOST],  # report where each number starts
+            )
+            _KWD_RATE_DB = db
+    return _KWD_RATE_DB or None
 
 def track_keyword_rate(logfile):
-    percentages = []
-    with open(logfile, 'r') as f:
-        for line in f:
-            # Match lines with "keyword extraction rate" and capture the percentage
-            match = re.search(r'([\d.]+)% keyword extraction rate', line)
-            if match:
-                percentages.append(float(match.group(1)))
-    return percentages
+    # mmap the log and scan it in one pass rather than a Python loop per line; the OS pages
+    # the file in as the scan advances. Hyperscan's SIMD literal matcher is used when
+    # installed (multi-GB logs), with the compiled regex as the fallback
+    with open(logfile, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            db = _get_kwd_rate_db()
+            if db is None:
+                return [float(m.group(1)) for m in _KWD_RATE_RE.finditer(mm)]
+
+            percentages = []
+
+            def on_match(pattern_id, start, end, flags, context):
+                percentages.append(float(mm[start:end - len(_KWD_RATE_SUFFIX)]))
+
+            db.scan(mm, match_event_handler=on_match)
+            return percentages
     
 if __name__ == "__main__":
     file = "/home/mkpuzo/mkpuzo-data/AURA_pdfs/papers_2025-11-3/2511.19427v1.pdf"